@@ -1,39 +1,91 @@
 """util functions."""
 from __future__ import annotations
 
-import copy
 import dataclasses
+import functools
 import json
 from pathlib import Path
-from typing import Any, ClassVar, Optional, Sequence, TypeVar, Union
-
-import tap
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from savethat import utils
+
+if TYPE_CHECKING:
+    import tap
 
 T = TypeVar("T")
 
 
-class _TapPatch(tap.Tap):
+class _TapPatchMixin:
+    """Patches `tap.Tap` to ignore `ClassVar` annotations.
+
+    The actual `tap.Tap` subclass is created by `_tap_patch_class`, so that
+    `tap` is only imported once an argument parser is needed.
+    """
+
     def _filter_variables(self, dct: dict[str, Any]) -> dict[str, Any]:
-        to_remove = [
-            key
-            for key, cls in dct.items()
-            if hasattr(cls, "__origin__") and cls.__origin__ is ClassVar
-        ]
-
-        for varname in list(dct.keys()):
-            if varname in to_remove:
+        for varname in list(dct):
+            if getattr(dct[varname], "__origin__", None) is ClassVar:
                 del dct[varname]
         return dct
 
     def _get_annotations(self) -> dict[str, Any]:
-        return self._filter_variables(super()._get_annotations())
+        return self._filter_variables(
+            super()._get_annotations()  # type: ignore
+        )
+
+    def _get_class_variables(self) -> dict[str, Any]:
+        return self._filter_variables(
+            super()._get_class_variables()  # type: ignore
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _tap_patch_class() -> type[tap.Tap]:
+    import tap
 
-    def _get_class_variables(self) -> dict[str, Any]:  # type: ignore
-        return self._filter_variables(super()._get_class_variables())
+    return type("_TapPatch", (_TapPatchMixin, tap.Tap), {})
+
+
+def _cache_per_class(func: Callable[[type], T]) -> Callable[[type], T]:
+    """Caches the result of `func` per class.
+
+    The result is stored on the class itself. Unlike `functools.lru_cache` or a
+    `weakref.WeakKeyDictionary`, whose values would reference the class, the
+    cache does not keep the classes alive, e.g. dynamically created `Args`
+    classes.
+    """
+    attr = f"_{func.__name__}_cache"
+
+    @functools.wraps(func)
+    def wrapper(cls: type) -> T:
+        # look up `cls.__dict__` to not use the cached result of a base class
+        try:
+            return cast(T, cls.__dict__[attr])
+        except KeyError:
+            result = func(cls)
+            setattr(cls, attr, result)
+            return result
 
+    return wrapper
 
-def _arg_parser_from_dataclass(cls: type) -> type[_TapPatch]:
-    """Creates an ArgumentParser from a dataclass using the tap library."""
+
+@_cache_per_class
+def _arg_parser_from_dataclass(cls: type) -> type[tap.Tap]:
+    """Creates an ArgumentParser from a dataclass using the tap library.
+
+    The parser class is created once per dataclass and then reused.
+    """
+    _TapPatch = _tap_patch_class()
     dct = dict(cls.__dict__)
 
     dct["__init__"] = _TapPatch.__init__
@@ -52,6 +104,19 @@ def _arg_parser_from_dataclass(cls: type) -> type[_TapPatch]:
     )
 
 
+@_cache_per_class
+def _arg_keys_of_dataclass(cls: type) -> tuple[str, ...]:
+    """Returns the argument names of the dataclass (cached per class)."""
+    args_parser = _arg_parser_from_dataclass(cls)()
+    return tuple(args_parser._get_annotations().keys())
+
+
+@_cache_per_class
+def _dataclass_field_names(cls: type) -> tuple[str, ...]:
+    """Returns the field names of the dataclass (cached per class)."""
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
 ARGS = TypeVar("ARGS", bound="Args")
 
 
@@ -81,13 +146,12 @@ class Args:
     """
 
     @classmethod
-    def _get_arg_parser(cls: type[ARGS]) -> _TapPatch:
+    def _get_arg_parser(cls: type[ARGS]) -> tap.Tap:
         return _arg_parser_from_dataclass(cls)()
 
     @classmethod
     def _get_keys(cls: type[ARGS]) -> list[str]:
-        args_parser = cls._get_arg_parser()
-        return list(args_parser._get_annotations().keys())
+        return list(_arg_keys_of_dataclass(cls))
 
     @classmethod
     def parse_args(
@@ -97,9 +161,10 @@ class Args:
     ) -> ARGS:
         args_parser = cls._get_arg_parser()
         parsed_args = args_parser.parse_args(args, known_only)
-        kwargs = {}
-        for argname in args_parser._get_annotations().keys():
-            kwargs[argname] = getattr(parsed_args, argname)
+        kwargs = {
+            argname: getattr(parsed_args, argname)
+            for argname in _arg_keys_of_dataclass(cls)
+        }
 
         try:
             obj = cls(**kwargs)
@@ -119,12 +184,11 @@ class Args:
         json_str: Optional[str] = None,
     ) -> ARGS:
         if path is not None:
-            path = Path(path)
-            with path.open() as f:
-                json_str = f.read()
-        if json_str is None:
+            state = utils.load_json(path)
+        elif json_str is not None:
+            state = json.loads(json_str)
+        else:
             raise ValueError("Either path or json_str must be provided.")
-        state = json.loads(json_str)
         return cls.from_dict(state)
 
     @classmethod
@@ -133,28 +197,21 @@ class Args:
         state: dict[str, Any],
         skip_unsettable: bool = False,
     ) -> ARGS:
-        args_parser = cls._get_arg_parser()
-        state = copy.copy(state)
-
-        if "__module__" in state:
-            del state["__module__"]
-        if "__qualname__" in state:
-            del state["__qualname__"]
-
-        args_parser.from_dict(state, skip_unsettable)
-        kwargs = {}
-        for argname in args_parser._annotations.keys():
-            if argname in ["_args_parser"]:
-                continue
-            kwargs[argname] = getattr(args_parser, argname)
-        return cls(**kwargs)
+        # Keys which are not arguments, e.g. the class info, are skipped.
+        # This is what `tap.Tap.from_dict` did as well, so `skip_unsettable`
+        # is only kept for compatibility.
+        field_names = _dataclass_field_names(cls)
+        return cls(
+            **{key: value for key, value in state.items() if key in field_names}
+        )
 
     def process_args(self) -> None:
         pass
 
     def as_dict(self, with_class_info: bool = False) -> dict[str, Any]:
         state = {
-            argname: getattr(self, argname) for argname in self._get_keys()
+            argname: getattr(self, argname)
+            for argname in _dataclass_field_names(type(self))
         }
         if with_class_info:
             state.update(
@@ -167,5 +224,4 @@ class Args:
 
     def save(self, path: Union[Path, str]) -> None:
         state = self.as_dict(with_class_info=True)
-        with open(path, "w") as f:
-            json.dump(state, f, indent=2)
+        utils.dump_json(state, path)
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import copy
 import dataclasses
+import functools
 import getpass
 import importlib
+import json
 import os
 import socket
+import sys
 from pathlib import Path
 from typing import Any, Optional, Union
 
-import anyconfig
-import toml
 from loguru import logger
 
 # from savethat import utils
@@ -29,6 +31,15 @@ def get_project_dir() -> Path:
     return _project_dir
 
 
+def _dir_contains(directory: Path, names: set[str]) -> set[str]:
+    """Returns the `names` that exist in `directory`, using a single scandir."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.name in names}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
 def infer_project_dir(package: str) -> Path:
     global _project_dir
     if _project_dir is not None:
@@ -45,10 +56,7 @@ def infer_project_dir(package: str) -> Path:
             project_dir = module_dir.parent
 
     project_dir = project_dir.resolve()
-    if not (
-        (project_dir / "pyproject.toml").exists()
-        or (project_dir / "setup.py").exists()
-    ):
+    if not _dir_contains(project_dir, {"pyproject.toml", "setup.py"}):
         raise Exception(
             f"Inferred project_dir '{project_dir}' does not "
             "look like a python package."
@@ -58,17 +66,72 @@ def infer_project_dir(package: str) -> Path:
     return project_dir
 
 
-def load_host_settings(directory: Path, ext: str = "toml") -> dict[str, Any]:
-    username = getpass.getuser()
-    host = socket.gethostname()
-    file = directory / f"{username}@{host}.{ext}"
-    if not file.exists():
-        file = directory / f"default.{ext}"
+@functools.lru_cache(maxsize=16)
+def _read_config_file_cached(
+    path: str, mtime_ns: int, size: int, file_type: str
+) -> dict[str, Any]:
+    file = Path(path)
+    if file_type == ".json":
+        return json.loads(file.read_bytes())
+    if file_type in (".yaml", ".yml"):
+        import yaml
+
+        return yaml.safe_load(file.read_bytes())
+    if file_type != ".toml":
+        import anyconfig
+
+        return anyconfig.load(file)
+
+    text = file.read_bytes().decode("utf-8")
+    if sys.version_info >= (3, 11):
+        import tomllib
+
+        return tomllib.loads(text)
+    else:
+        import toml
+
+        return toml.loads(text)
+
 
-    if not file.exists():
+def read_config_file(
+    path: Union[Path, str], file_type: Optional[str] = None
+) -> dict[str, Any]:
+    """Reads a config file.
+
+    The parsed content is cached until the file's modification time or size
+    changes. Do not modify the returned dictionary.
+
+    Args:
+        path: the config file.
+        file_type: the format of the file, e.g. `".toml"`. Defaults to the
+            suffix of `path`.
+    """
+    path = Path(path)
+    stat = path.stat()
+    return _read_config_file_cached(
+        str(path), stat.st_mtime_ns, stat.st_size, file_type or path.suffix
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _user_and_host() -> tuple[str, str]:
+    """Returns the user and host name. Both do not change during a process."""
+    return getpass.getuser(), socket.gethostname()
+
+
+def load_host_settings(directory: Path, ext: str = "toml") -> dict[str, Any]:
+    username, host = _user_and_host()
+    host_file = f"{username}@{host}.{ext}"
+    default_file = f"default.{ext}"
+    found = _dir_contains(directory, {host_file, default_file})
+    if host_file in found:
+        file = directory / host_file
+    elif default_file in found:
+        file = directory / default_file
+    else:
         raise FileNotFoundError(f"No env file found in {directory}")
 
-    return anyconfig.load(file)
+    return copy.deepcopy(read_config_file(file))
 
 
 def _get_credential_file(file_name: Union[Path, str, None] = None) -> Path:
@@ -103,8 +166,7 @@ def load_credentials(
 ) -> B2Credentials:
     credential_file = _get_credential_file(file_name)
     logger.debug(f"Reading credentials from {credential_file}")
-    with open(credential_file) as f:
-        return B2Credentials(**anyconfig.load(f)[package_name])
+    return B2Credentials(**read_config_file(credential_file)[package_name])
 
 
 def store_credentials(
@@ -112,12 +174,14 @@ def store_credentials(
     credentials: B2Credentials,
     file_name: Union[None, str, Path] = None,
 ) -> None:
+    import toml
+
     credential_file = _get_credential_file(file_name)
     logger.debug(f"Saving credentials to {credential_file}")
 
     if credential_file.exists():
-        with open(credential_file) as f:
-            config = toml.load(f)
+        # the credentials are always written as TOML, whatever the suffix
+        config = copy.deepcopy(read_config_file(credential_file, ".toml"))
     else:
         config = {}
 
@@ -128,8 +192,7 @@ def store_credentials(
     tmp_cred_file.write_text("")
     tmp_cred_file.chmod(0o600)
 
-    with open(tmp_cred_file, "w") as f:
-        toml.dump(config, f)
+    tmp_cred_file.write_text(toml.dumps(config))
 
     tmp_cred_file.rename(credential_file)
     credential_file.chmod(0o600)
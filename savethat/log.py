@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 from typing import Any, Optional
@@ -32,9 +33,10 @@ def setup_logger(
             diagnose=True,
             format=format,
         )
-        _logger.add(
-            output_dir / "output.jsonl", serialize=True, level=file_level
-        )
+        if os.environ.get("SAVETHAT_JSONL", "1") != "0":
+            _logger.add(
+                output_dir / "output.jsonl", serialize=True, level=file_level
+            )
         _logger.info(f"Use logger output_dir: {str(output_dir)}")
 
     global logger
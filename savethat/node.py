@@ -3,8 +3,8 @@ from __future__ import annotations
 import abc
 import copy
 import dataclasses
+import itertools
 import pickle
-import random
 import sys
 from pathlib import Path
 from typing import Any, Callable, Generic, Optional, TypeVar, Union
@@ -32,12 +32,44 @@ class HookHandle:
 _reproducible: Optional[reproducible_mod.Context] = None
 
 
+def _copy_containers(value: Any) -> Any:
+    """Copies nested dicts and lists.
+
+    Unlike `copy.deepcopy`, all other values, e.g. the strings of the
+    collected context, are shared.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_containers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(item) for item in value]
+    return value
+
+
+def _copy_reproducible(
+    reproducible: reproducible_mod.Context,
+) -> reproducible_mod.Context:
+    """Returns a copy which can be modified without changing `reproducible`.
+
+    All containers of the collected data are copied, so e.g. `add_repo` or
+    `add_file` on the copy do not change the original.
+    """
+    copied = copy.copy(reproducible)
+    copied.data = _copy_containers(reproducible.data)
+    return copied
+
+
 def get_reproducible(
     project_dir: io.PATH_LIKE, reload: bool = False
 ) -> reproducible_mod.Context:
+    """Returns the reproducible context of the current process.
+
+    The context is collected once. Each call returns a copy which can be
+    modified, see `_copy_reproducible`. Use `reload=True` to collect the
+    context again.
+    """
     global _reproducible
     if _reproducible is not None and not reload:
-        return copy.deepcopy(_reproducible)
+        return _copy_reproducible(_reproducible)
 
     reproducible = reproducible_mod.Context()
     reproducible.add_repo(path=str(project_dir), allow_dirty=True, diff=True)
@@ -46,7 +78,7 @@ def get_reproducible(
     reproducible.add_pip_packages()
     reproducible.add_cpu_info()
     _reproducible = reproducible
-    return copy.deepcopy(reproducible)
+    return _copy_reproducible(reproducible)
 
 
 class Node(Generic[ARGS, T], metaclass=abc.ABCMeta):
@@ -58,6 +90,19 @@ class Node(Generic[ARGS, T], metaclass=abc.ABCMeta):
         args: The parsed arguments.
     """
 
+    # if true, the arguments are uploaded before `_run` is called, so runs
+    # that are killed or still running can be found remotely. Set to false
+    # to upload them only together with the results.
+    upload_args_eagerly: bool = True
+
+    _hook_ids = itertools.count()
+    # incremented for every new subclass, invalidates cached node discovery
+    _n_subclasses = 0
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        Node._n_subclasses += 1
+
     @classmethod
     def get_args_class(cls) -> type[ARGS]:
         """Returns the type of the ARGS generic.
@@ -97,15 +142,11 @@ class Node(Generic[ARGS, T], metaclass=abc.ABCMeta):
         self.args = args
         self.project_dir = env_mod.get_project_dir()
 
-        if reproducible is None:
-            self.reproducible = self.init_reproducible()
+        # collecting the context is expensive, see the `reproducible` property
+        if reproducible is not None:
+            self._add_node_data(reproducible)
+        self._reproducible = reproducible
 
-        self.reproducible.add_data(
-            "node.__module__", str(type(self).__module__)
-        )
-        self.reproducible.add_data(
-            "node.__qualname__", str(type(self).__qualname__)
-        )
         self._hooks_pre_run: dict[int, Callable[[Node[ARGS, T]], None]] = {}
         self._hooks_run: dict[int, Callable[[Node[ARGS, T], T], None]] = {}
 
@@ -126,12 +167,33 @@ class Node(Generic[ARGS, T], metaclass=abc.ABCMeta):
     def init_reproducible(self) -> reproducible_mod.Context:
         return get_reproducible(self.project_dir)
 
+    @property
+    def reproducible(self) -> reproducible_mod.Context:
+        """The reproducible context of the node.
+
+        It is collected on first access, so nodes that are never run do not
+        pay for it.
+        """
+        if self._reproducible is None:
+            reproducible = self.init_reproducible()
+            self._add_node_data(reproducible)
+            self._reproducible = reproducible
+        return self._reproducible
+
+    @reproducible.setter
+    def reproducible(self, reproducible: reproducible_mod.Context) -> None:
+        self._reproducible = reproducible
+
+    def _add_node_data(self, reproducible: reproducible_mod.Context) -> None:
+        reproducible.add_data("node.__module__", str(type(self).__module__))
+        reproducible.add_data("node.__qualname__", str(type(self).__qualname__))
+
     def register_pre_run_hook(
         self,
         hook: Callable[[Node[ARGS, T]], None],
     ) -> HookHandle:
         """Registers a hook which is executed before the node is run."""
-        idx = random.randint(0, 2**64)
+        idx = next(self._hook_ids)
         self._hooks_pre_run[idx] = hook
         return HookHandle(self._hooks_pre_run, idx)
 
@@ -139,7 +201,7 @@ class Node(Generic[ARGS, T], metaclass=abc.ABCMeta):
         self, hook: Callable[[Node[ARGS, T], T], None]
     ) -> HookHandle:
         """Registers a hook which is executed after the node is run."""
-        idx = random.randint(0, 2**64)
+        idx = next(self._hook_ids)
         self._hooks_run[idx] = hook
         return HookHandle(self._hooks_run, idx)
 
@@ -179,15 +241,21 @@ class Node(Generic[ARGS, T], metaclass=abc.ABCMeta):
             self.args.save(args_file)
             self.logger.info(f"Saving arguments to: {args_file}")
 
-            self.reproducible.export_json(self.output_dir / "reproducible.json")
+            utils.dump_json(
+                self.reproducible.data,
+                self.output_dir / "reproducible.json",
+                sort_keys=True,
+            )
 
-            self.storage.upload(self.key)
+            if self.upload_args_eagerly:
+                self.storage.upload(self.key)
             result = self._run()
 
             pickle_file = self.output_dir / "results.pickle"
             self.logger.info(f"Saving results to to: {pickle_file}")
-            with open(pickle_file, "wb") as fb:
-                pickle.dump(result, fb)
+            # large buffer: results often contain big arrays
+            with open(pickle_file, "wb", buffering=1 << 20) as fb:
+                pickle.dump(result, fb, protocol=pickle.HIGHEST_PROTOCOL)
 
             for hook in self._hooks_run.values():
                 hook(self, result)
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import copy
 import datetime
+import functools
 import inspect
+import re
 import sys
 from pathlib import Path
-from typing import Any, Iterator, Optional, TypeVar, Union
-
-import anyconfig
+from typing import Any, Iterable, Iterator, Optional, TypeVar, Union
 
 from savethat import args, env, io, log, logger
 from savethat import node as node_mod
@@ -17,6 +18,62 @@ from savethat.node import Node
 ARGS = TypeVar("ARGS", bound="args.Args")
 T = TypeVar("T")
 
+# the value of `--last`, e.g. `30`, `12h` or `2d`
+_LAST_RE = re.compile(r"(\d+)\s*([mhd]?)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_all_subclasses(n_subclasses: int) -> tuple[type[Node], ...]:
+    """Returns all non-abstract subclasses of `Node`.
+
+    `n_subclasses` is `Node._n_subclasses`, so the result is computed again
+    whenever a new node class was defined.
+    """
+    # a dict keeps the discovery order, which makes the result deterministic
+    subclasses: dict[type[Node], None] = {}
+    to_scan: list[type] = [Node]
+    while to_scan:
+        cls = to_scan.pop()
+        # formatted by loguru only if a sink accepts debug messages
+        logger.debug("Scanning: {}.{}", cls.__module__, cls.__qualname__)
+        for subclass in cls.__subclasses__():
+            if subclass not in subclasses:
+                subclasses[subclass] = None
+                to_scan.append(subclass)
+
+    qualified_subclasses = []
+    for cls in subclasses:
+        if getattr(cls, "__abstractmethods__", None):
+            logger.info(
+                f"`{cls.__module__}.{cls.__qualname__}`"
+                " is an abstract class -- will ignore it."
+            )
+        else:
+            qualified_subclasses.append(cls)
+
+    return tuple(qualified_subclasses)
+
+
+def _sort_nodes(nodes: Iterable[type[Node]]) -> list[type[Node]]:
+    return sorted(nodes, key=lambda c: (c.__module__, c.__qualname__))
+
+
+@functools.lru_cache(maxsize=1)
+def _node_lookup(
+    n_subclasses: int,
+) -> tuple[dict[str, type[Node]], dict[str, list[type[Node]]]]:
+    """Returns the nodes by their full name and by their qualname."""
+    by_full_name: dict[str, type[Node]] = {}
+    by_qualname: dict[str, list[type[Node]]] = {}
+    for cls in _find_all_subclasses(n_subclasses):
+        by_full_name[f"{cls.__module__}.{cls.__qualname__}"] = cls
+        by_qualname.setdefault(cls.__qualname__, []).append(cls)
+    return by_full_name, by_qualname
+
+
+# packages whose submodules were already imported by a `MainRunner`
+_imported_packages: set[str] = set()
+
 
 class MainRunner:
     def __init__(
@@ -44,10 +101,11 @@ class MainRunner:
             help="Print debug information.",
         )
 
-        first_no_dash = min(
-            (i for i, a in enumerate(self.all_argv) if not a.startswith("--")),
-            default=len(self.all_argv),
-        )
+        first_no_dash = len(self.all_argv)
+        for i, arg in enumerate(self.all_argv):
+            if not arg.startswith("--"):
+                first_no_dash = i
+                break
 
         setup_args = self.all_argv[:first_no_dash]
         if len(setup_args) > 0 and "--credentials" == setup_args[-1]:
@@ -72,230 +130,286 @@ class MainRunner:
         else:
             self.project_dir = env.infer_project_dir(self.package)
 
+        self._storage: Optional[io.Storage] = None
         self.create_parser()
 
     @staticmethod
     def find_all_subclasses() -> list[type[Node]]:
-        def all_subclasses(cls: type) -> set[type[Node]]:
-            logger.debug(f"Scanning: {cls.__module__}.{cls.__qualname__}")
-            return set(cls.__subclasses__()).union(
-                [s for c in cls.__subclasses__() for s in all_subclasses(c)]
-            )
-
-        subclasses: set[type[Node]] = all_subclasses(Node)
+        return _sort_nodes(_find_all_subclasses(Node._n_subclasses))
 
-        qualified_subclasses = []
-        for cls in subclasses:
-            if inspect.isabstract(cls):
-                logger.info(
-                    f"`{cls.__module__}.{cls.__qualname__}`"
-                    " is an abstract class -- will ignore it."
-                )
-            else:
-                qualified_subclasses.append(cls)
+    @staticmethod
+    def clear_cache() -> None:
+        """Forgets the imported packages and the discovered nodes."""
+        _imported_packages.clear()
+        _find_all_subclasses.cache_clear()
+        _node_lookup.cache_clear()
 
-        return sorted(
-            qualified_subclasses,
-            key=lambda c: (c.__module__, c.__qualname__),
-        )
+    def _import_package(self) -> None:
+        if self.package not in _imported_packages:
+            utils.import_submodules(self.package, ignore_errors=False)
+            _imported_packages.add(self.package)
 
     def get_nodes(self) -> list[type[Node]]:
-        utils.import_submodules(self.package, ignore_errors=False)
+        self._import_package()
         return self.find_all_subclasses()
 
+    # the available actions and their descriptions
+    ACTIONS = {
+        "nodes": "List all nodes.",
+        "run": "Runs a node.",
+        "setup_b2": "Setup B2 credentials.",
+        "download": "Downloads a run from B2.",
+        "upload": "Uploads a run to B2.",
+        "ls": "List past runs.",
+        "rm": "Removes runs (local and remote).",
+    }
+
     def create_parser(
         self,
     ):
+        # Only the parser of the invoked action is created. If the action is
+        # unknown, all parsers are registered such that argparse can list
+        # them in its error message.
+        action = self.argv[0] if self.argv else None
+        if action not in self.ACTIONS:
+            action = None
+        self.parser, self.subparsers = self._build_parser(action)
+        # `None` if the parser of the action was not built
+        self.run_parser = self.subparsers.choices.get("run")
+        self.ls_parser = self.subparsers.choices.get("ls")
+        self.rm_parser = self.subparsers.choices.get("rm")
+
+    def _action_parser(self, action: str) -> argparse.ArgumentParser:
+        """Returns the parser of `action` and builds it if necessary."""
+        parser = self.subparsers.choices.get(action)
+        if parser is None:
+            _, subparsers = self._build_parser(action)
+            parser = subparsers.choices[action]
+        return parser
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _build_parser(
+        cls, action: Optional[str]
+    ) -> tuple[
+        argparse.ArgumentParser,
+        argparse._SubParsersAction[argparse.ArgumentParser],
+    ]:
+        """Builds the parser for `action` or for all actions if `None`.
+
+        The parsers do not depend on the instance and are cached.
+        """
+
+        def build(name: str) -> bool:
+            return action is None or action == name
 
         # we need to use argparse as tap cannot handle subparsers properly.
-        self.parser = argparse.ArgumentParser()
-        self.parser.set_defaults(func=self.help)
-        self.subparsers = self.parser.add_subparsers()
+        parser = argparse.ArgumentParser()
+        subparsers = parser.add_subparsers()
 
         # ---------------------------------------------------------------
         # nodes
 
-        nodes_parser = self.subparsers.add_parser(
-            "nodes", description="List all nodes."
-        )
-        nodes_parser.set_defaults(func=self.list_nodes)
+        if build("nodes"):
+            subparsers.add_parser("nodes", description=cls.ACTIONS["nodes"])
 
         # ---------------------------------------------------------------
         # run
 
-        self.run_parser = self.subparsers.add_parser(
-            "run", description="Runs a node.", add_help=False
-        )
-        self.run_parser.add_argument(
+        if build("run"):
+            run_parser = subparsers.add_parser(
+                "run", description=cls.ACTIONS["run"], add_help=False
+            )
+            cls._add_run_arguments(run_parser)
+
+        # ---------------------------------------------------------------
+        # setup_b2
+
+        if build("setup_b2"):
+            subparsers.add_parser(
+                "setup_b2", description=cls.ACTIONS["setup_b2"], add_help=True
+            )
+
+        # ---------------------------------------------------------------
+        # download
+
+        if build("download"):
+            download_parser = subparsers.add_parser(
+                "download", description=cls.ACTIONS["download"], add_help=True
+            )
+            download_parser.add_argument(
+                "key",
+                nargs=1,
+                default="",
+                help="Key to download.",
+            )
+
+        # ---------------------------------------------------------------
+        # upload
+
+        if build("upload"):
+            upload_parser = subparsers.add_parser(
+                "upload", description=cls.ACTIONS["upload"], add_help=True
+            )
+            upload_parser.add_argument(
+                "key",
+                nargs=1,
+                default="",
+                help="Key to upload.",
+            )
+
+        # ---------------------------------------------------------------
+        # ls
+
+        if build("ls"):
+            ls_parser = subparsers.add_parser(
+                "ls", description=cls.ACTIONS["ls"], add_help=True
+            )
+            cls._add_ls_arguments(ls_parser)
+
+        # ---------------------------------------------------------------
+        # rm
+
+        if build("rm"):
+            rm_parser = subparsers.add_parser(
+                "rm", description=cls.ACTIONS["rm"], add_help=False
+            )
+            cls._add_rm_arguments(rm_parser)
+        return parser, subparsers
+
+    @staticmethod
+    def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
+        """Adds the arguments of the `run` action."""
+        parser.add_argument(
             "-h",
             "--help",
             action="store_true",
             help="Print help message.",
         )
-        self.run_parser.add_argument(
+        parser.add_argument(
             "--pdb",
             action="store_true",
             default=False,
             help="enter pdb debuggin on error",
         )
-        self.run_parser.add_argument(
+        parser.add_argument(
             "node_name",
             nargs="?",
             type=str,
             default="",
             help="enter pdb debuggin on error",
         )
-        self.run_parser.add_argument(
+        parser.add_argument(
             "--config",
             type=str,
             default=None,
             help="path to a config file containing the node's parameters.",
         )
-        self.run_parser.set_defaults(func=self.run)
 
-        # ---------------------------------------------------------------
-        # setup_b2
-        setup_b2_parser = self.subparsers.add_parser(
-            "setup_b2", description="Setup B2 credentials.", add_help=True
-        )
-        setup_b2_parser.set_defaults(func=self.setup_b2)
-        # ---------------------------------------------------------------
-        # download
-
-        download_parser = self.subparsers.add_parser(
-            "download", description="Downloads a run from B2.", add_help=True
-        )
-        download_parser.set_defaults(func=self.download)
-        download_parser.add_argument(
-            "key",
-            nargs=1,
-            default="",
-            help="Key to download.",
-        )
-        # ---------------------------------------------------------------
-        # upload
-
-        upload_parser = self.subparsers.add_parser(
-            "upload", description="Uploads a run to B2.", add_help=True
-        )
-        upload_parser.set_defaults(func=self.upload)
-        upload_parser.add_argument(
-            "key",
-            nargs=1,
-            default="",
-            help="Key to upload.",
-        )
-        # ---------------------------------------------------------------
-        # ls
-
-        self.ls_parser = self.subparsers.add_parser(
-            "ls", description="List past runs.", add_help=True
-        )
-        self.ls_parser.set_defaults(func=self.ls)
-        self.ls_parser.add_argument(
-            "-r", "--recursive", help="Recursively list files."
-        )
-        self.ls_parser.add_argument(
+    @staticmethod
+    def _add_ls_arguments(parser: argparse.ArgumentParser) -> None:
+        """Adds the arguments of the `ls` action."""
+        parser.add_argument("-r", "--recursive", help="Recursively list files.")
+        parser.add_argument(
             "--before", default=None, help="List outputs before this date."
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "--after", default=None, help="List outputs after this date."
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "--all",
             default=False,
             action="store_true",
             help="List all files of the runs.",
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "--failed",
             action="store_true",
             default=False,
             help="List only runs without results.",
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "--completed",
             action="store_true",
             default=False,
             help="List only runs with results.",
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "--local",
             default=False,
             action="store_true",
             help="List only locally stored runs.",
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "--last",
             default=None,
             help="Remove runs in the last minutes / hours / days, "
             "e.g. '1h' or '1d'. If no unit is specified, minutes are assumed.",
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "-a",
             "--absolute",
             action="store_true",
             help="Print absolute paths.",
         )
-        self.ls_parser.add_argument(
+        parser.add_argument(
             "path",
             nargs="?",
             default="",
             help="(Partial) path to search for outputs.",
         )
 
-        # ---------------------------------------------------------------
-        # rm
-
-        self.rm_parser = self.subparsers.add_parser(
-            "rm", description="Removes runs (local and remote).", add_help=False
-        )
-        self.rm_parser.add_argument(
+    @staticmethod
+    def _add_rm_arguments(parser: argparse.ArgumentParser) -> None:
+        """Adds the arguments of the `rm` action."""
+        parser.add_argument(
             "-h", "--help", action="store_true", help="Print help message."
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--failed",
             action="store_true",
             default=False,
             help="Remove runs without results.",
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--local",
             action="store_true",
             default=False,
             help="Remove runs only locally.",
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--force",
             action="store_true",
             default=False,
             help="Do not ask for confirmation.",
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--dry",
             action="store_true",
             default=False,
             help="Do a dry run. Does not delete anything.",
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--last",
             default=None,
             help="Remove runs in the last minutes / hours / days, "
             "e.g. '1h' or '1d'. If no unit is specified, minutes are assumed.",
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--before", default=None, help="Remove runs before this date."
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "--after", default=None, help="Remove runs after this date."
         )
-        self.rm_parser.add_argument(
+        parser.add_argument(
             "path",
             nargs="?",
             default="",
             help="(Partial) path to search for outputs.",
         )
-        self.rm_parser.set_defaults(func=self.rm)
+        # `rm` never filters for completed runs, but `_ls_runs` expects the
+        # same namespace as for `ls`.
+        parser.set_defaults(completed=False)
 
     def get_credentials(
         self, credentials_file: Optional[io.PATH_LIKE]
@@ -314,34 +428,51 @@ class MainRunner:
             return credentials
 
     def help(self) -> None:
-        print("Here is a list with all available actions:", file=sys.stderr)
-        for name, choice in self.subparsers.choices.items():
-            print(f"    {name:<10} {choice.description}", file=sys.stderr)
+        lines = ["Here is a list with all available actions:"]
+        for name, description in self.ACTIONS.items():
+            lines.append(f"    {name:<10} {description}")
+        print("\n".join(lines), file=sys.stderr)
 
     def print_no_action(self) -> None:
-        print("Error, no action was given!", file=sys.stderr)
         print(
+            "Error, no action was given!\n"
             f"Use `{self.argv[0]} help` to print a list of available actions.",
             file=sys.stderr,
         )
 
     def get_node(self, node_name: str) -> type[Node[ARGS, T]]:
-        nodes = self.get_nodes()
-        matched_nodes = []
         if "." in node_name:
-            for node in nodes:
-                if f"{node.__module__}.{node.__qualname__}" == node_name:
-                    matched_nodes.append(node)
-        else:
-            for node in nodes:
-                if node.__qualname__ == node_name:
-                    matched_nodes.append(node)
-
+            # a full name can be imported directly without importing and
+            # scanning the whole package
+            module_name, _, class_name = node_name.rpartition(".")
+            try:
+                node_cls = utils.load_class(module_name, class_name)
+            except (ImportError, AttributeError):
+                node_cls = None
+            if (
+                inspect.isclass(node_cls)
+                and issubclass(node_cls, Node)
+                and not inspect.isabstract(node_cls)
+            ):
+                return node_cls
+
+        self._import_package()
+        by_full_name, by_qualname = _node_lookup(Node._n_subclasses)
+        if node_name in by_full_name:
+            return by_full_name[node_name]
+
+        matched_nodes = by_qualname.get(node_name, [])
         if len(matched_nodes) == 0:
-            print(f"Did not found a Node with name: `{node_name}`")
+            raise ValueError(f"Did not found a Node with name: `{node_name}`")
         if len(matched_nodes) > 1:
-            print(f"Found multiple Nodes with name: `{node_name}`")
-
+            full_names = ", ".join(
+                f"{node.__module__}.{node.__qualname__}"
+                for node in _sort_nodes(matched_nodes)
+            )
+            raise ValueError(
+                f"Found multiple Nodes with name: `{node_name}`. "
+                f"Use the full name of one of: {full_names}"
+            )
         return matched_nodes[0]
 
     def _print_help_and_exit(self, parser: argparse.ArgumentParser) -> bool:
@@ -355,11 +486,12 @@ class MainRunner:
         return False
 
     def run(self) -> Union[None, tuple[Node, Any]]:
-        if self._print_help_and_exit(self.run_parser):
+        if self._print_help_and_exit(self._action_parser("run")):
             return None
 
         node_name = self.args.node_name
-        node_args = self.argv[self.argv.index(node_name) + 1 :]
+        node_idx = self.argv.index(node_name)
+        node_args = self.argv[node_idx + 1 :]
         node_cls: type[Node] = self.get_node(node_name)
 
         with utils.pdb_post_mortem(self.args.pdb):
@@ -368,13 +500,13 @@ class MainRunner:
 
             # if config is set and
 
-            read_config_from_file = False
-
-            if self.args.config is not None:
-                # --config flag given but after node?
-                read_config_from_file = self.argv.index(
-                    "--config"
-                ) < self.argv.index(node_name)
+            # --config flag given but after node?
+            config_idx = (
+                self.argv.index("--config")
+                if self.args.config is not None
+                else -1
+            )
+            read_config_from_file = 0 <= config_idx < node_idx
 
             if read_config_from_file:
                 if len(self.unknown_args) != 0:
@@ -383,7 +515,9 @@ class MainRunner:
                         f"Config file: {self.args.config}\n"
                         f"Arguments: {self.unknown_args}\n"
                     )
-                node_args = anyconfig.load(self.args.config)
+                node_args = copy.deepcopy(
+                    env.read_config_file(self.args.config)
+                )
 
             created_node: Node = node_mod.create_node(
                 node_cls,
@@ -403,18 +537,28 @@ class MainRunner:
         return created_node, result
 
     def list_nodes(self) -> None:
-        nodes = self.get_nodes()
-        cls_names = [f"{cls.__module__}.{cls.__qualname__}" for cls in nodes]
-        cls_length = max(len(cls_name) for cls_name in cls_names)
-        print("")
-        print("Found the following executable nodes:")
-        for cls_name, cls in zip(cls_names, nodes):
-            first_doc_line = (cls.__doc__ or "[no docstring]").split("\n")[0]
-            print(f"    {cls_name.ljust(cls_length)}  - {first_doc_line}")
+        self._import_package()
+        # the full names are already computed for `get_node`
+        by_full_name, _ = _node_lookup(Node._n_subclasses)
+        if not by_full_name:
+            print("No executable nodes found.")
+            return
+        cls_length = max(map(len, by_full_name))
+        lines = ["", "Found the following executable nodes:"]
+        for cls in _sort_nodes(by_full_name.values()):
+            cls_name = f"{cls.__module__}.{cls.__qualname__}"
+            doc = cls.__doc__ or "[no docstring]"
+            first_doc_line = doc.partition("\n")[0]
+            lines.append(
+                f"    {cls_name.ljust(cls_length)}  - {first_doc_line}"
+            )
 
-        print("")
-        print("For more information on each analysis execute:")
-        print(f"     python -m {self.package} run {cls_names[-1]} --help")
+        lines += [
+            "",
+            "For more information on each analysis execute:",
+            f"     python -m {self.package} run {cls_name} --help",
+        ]
+        print("\n".join(lines))
 
     def _ls_runs(
         self,
@@ -428,25 +572,25 @@ class MainRunner:
         else:
             before = None
 
-        last = getattr(self.args, "last")
+        last = self.args.last
         if last and self.args.after is not None:
             raise ValueError("Cannot use both --last and --after")
         if last is not None:
-            unit = "m"
-            if last[-1].lower() in "mhd":
-                unit = last[-1].lower()
-            if last[-1].lower() in "mhd":
-                value = int(last[:-1])
+            match = _LAST_RE.fullmatch(last.strip())
+            if match is None:
+                raise ValueError(
+                    f"Invalid value for --last: `{last}`. "
+                    "Expected a number with an optional unit m, h or d."
+                )
+            value = int(match.group(1))
+            unit = match.group(2).lower() or "m"
+
+            if unit == "m":
+                offset = datetime.timedelta(minutes=value)
+            elif unit == "h":
+                offset = datetime.timedelta(hours=value)
             else:
-                value = int(last)
-
-            offset = {
-                "m": datetime.timedelta(
-                    minutes=value,
-                ),
-                "h": datetime.timedelta(hours=value),
-                "d": datetime.timedelta(days=value),
-            }[unit]
+                offset = datetime.timedelta(days=value)
             after = datetime.datetime.now(datetime.timezone.utc) - offset
             d = after
             assert d.tzinfo is not None and d.tzinfo.utcoffset(d) is not None
@@ -459,7 +603,7 @@ class MainRunner:
             f"Finding runs in {storage / ''} with prefix {self.args.path}",
             remote=not local,
             only_failed=self.args.failed,
-            only_completed=getattr(self.args, "completed", False),
+            only_completed=self.args.completed,
             before=before,
             after=after,
         )
@@ -467,15 +611,18 @@ class MainRunner:
             self.args.path,
             remote=not local,
             only_failed=self.args.failed,
-            only_completed=getattr(self.args, "completed", False),
+            only_completed=self.args.completed,
             absolute=absolute,
             before=before,
             after=after,
         )
 
     def get_storage(self) -> io.Storage:
-        credentials = self.get_credentials(self.credential_file)
-        return io.B2Storage.from_credentials(credentials)
+        """Returns the storage. It is created once per runner."""
+        if self._storage is None:
+            credentials = self.get_credentials(self.credential_file)
+            self._storage = io.B2Storage.from_credentials(credentials)
+        return self._storage
 
     def setup_b2(self) -> None:
         env.setup_credentials(
@@ -506,8 +653,11 @@ class MainRunner:
         storage = self.get_storage()
 
         if self.args.force:
-            for run, _ in self._ls_runs(storage):
-                storage.remove(run, local=True, remote=not self.args.local)
+            storage.remove_many(
+                (run for run, _ in self._ls_runs(storage)),
+                local=True,
+                remote=not self.args.local,
+            )
             return
 
         if self.args.local:
@@ -549,23 +699,43 @@ class MainRunner:
             print("Aborting.")
             return
 
-        for run in runs:
-            print(storage.remove.__code__)
-            storage.remove(run, local=True, remote=not self.args.local)
+        storage.remove_many(runs, local=True, remote=not self.args.local)
 
     def __call__(self) -> Optional[tuple[Node[ARGS, T], T]]:
         if not self.argv or self.argv[0] in ["-h", "help", "--help"]:
             self.help()
             return None
 
-        if self.argv[0] == "run":
-            self.args, self.unknown_args = self.parser.parse_known_args(
-                self.argv
-            )
+        # `run --help` without a node name needs no parsing
+        if self.argv[0] == "run" and self.argv[1:] in (["-h"], ["--help"]):
+            self._action_parser("run").print_help()
+            return None
+
+        # dispatch known actions directly to their parser. Unknown actions
+        # go through the main parser, which reports the valid choices.
+        action = self.argv[0]
+        if action in self.ACTIONS:
+            parser = self.subparsers.choices[action]
+            argv = self.argv[1:]
+        else:
+            parser = self.parser
+            argv = self.argv
+
+        if action == "run":
+            self.args, self.unknown_args = parser.parse_known_args(argv)
         else:
-            self.args = self.parser.parse_args(self.argv)
+            self.args = parser.parse_args(argv)
             self.unknown_args = []
-        return self.args.func()
+        handlers = {
+            "nodes": self.list_nodes,
+            "run": self.run,
+            "setup_b2": self.setup_b2,
+            "download": self.download,
+            "upload": self.upload,
+            "ls": self.ls,
+            "rm": self.rm,
+        }
+        return handlers.get(action, self.help)()
 
 
 def run_main(
@@ -4,15 +4,34 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
+import functools
 import importlib
+import json
+import math
 import pdb
 import pkgutil
+import re
 import sys
 import time
 import traceback
 from datetime import datetime, timezone
+from pathlib import Path
 from types import ModuleType
-from typing import Any, Callable, Iterator, Optional, TypeVar, cast
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 T = TypeVar("T")
 
@@ -34,22 +53,96 @@ def default(factory: Callable[[], T]) -> T:
     return dataclasses.field(default_factory=factory)
 
 
+def _orjson_writes_like_json(obj: Any) -> bool:
+    """Returns whether `orjson` writes `obj` like the stdlib `json`.
+
+    This is the case for JSON-native values: finite floats, integers fitting
+    into 64 bits, strings, booleans, `None`, and lists, tuples and dicts with
+    string keys of those. Subclasses, e.g. enums, are left to the stdlib.
+    """
+    obj_type = type(obj)
+    if obj_type is float:
+        return math.isfinite(obj)
+    if obj_type is int:
+        return -(2**63) <= obj < 2**64
+    if obj_type in (str, bool, type(None)):
+        return True
+    if obj_type is dict:
+        return all(type(key) is str for key in obj) and all(
+            map(_orjson_writes_like_json, obj.values())
+        )
+    if obj_type in (list, tuple):
+        return all(map(_orjson_writes_like_json, obj))
+    return False
+
+
+# integers with this many digits might not fit into 64 bits
+_LONG_INT = re.compile(rb"\d{19}")
+
+
+def dump_json(
+    obj: Any, path: Union[str, Path], sort_keys: bool = False
+) -> None:
+    """Writes `obj` as indented JSON to `path`.
+
+    Uses `orjson` if it is installed and `obj` only holds JSON-native values,
+    see `_orjson_writes_like_json`. Anything else, e.g. NaN, integers larger
+    than 64 bits or non-string keys, is written by the stdlib, so the output
+    does not depend on whether `orjson` is installed.
+    """
+    if orjson is not None and _orjson_writes_like_json(obj):
+        options = orjson.OPT_INDENT_2
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        Path(path).write_bytes(orjson.dumps(obj, option=options))
+    else:
+        Path(path).write_text(json.dumps(obj, indent=2, sort_keys=sort_keys))
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Reads the JSON file at `path`.
+
+    Uses `orjson` if it is installed and falls back to the stdlib otherwise.
+    """
+    data = Path(path).read_bytes()
+    if orjson is not None and not _LONG_INT.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or Infinity, which only the stdlib accepts
+            pass
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_class_cached(module_name: str, class_name: str) -> type[Any]:
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
 def load_class(module_name: str, class_name: Optional[str] = None) -> type[Any]:
     if class_name is None:
-        parts = module_name.split(".")
-        module_name = ".".join(parts[:-1])
-        class_name = parts[-1]
-    module = importlib.import_module(module_name)
-    clazz = getattr(module, class_name)
-    return clazz
+        module_name, _, class_name = module_name.rpartition(".")
+    cls = _load_class_cached(module_name, class_name)
+    module = sys.modules.get(module_name)
+    if module is None or getattr(module, class_name, None) is not cls:
+        # the module was reloaded or removed since the class was cached
+        _load_class_cached.cache_clear()
+        cls = _load_class_cached(module_name, class_name)
+    return cls
 
 
 def import_submodules(
     package_name: str,
     recursive: bool = True,
     ignore_errors: bool = True,
+    exclude: Sequence[str] = ("tests", "benchmarks"),
 ) -> dict[str, ModuleType]:
-    """Import all submodules of a module, recursively, including subpackages."""
+    """Import all submodules of a module, recursively, including subpackages.
+
+    Submodules and subpackages whose name is in `exclude` are skipped
+    together with everything below them.
+    """
     package = importlib.import_module(package_name)
     results = {}
 
@@ -60,20 +153,25 @@ def import_submodules(
     else:
         raise ValueError(f"Cannot find file for package: {package}")
 
-    for loader, name, is_pkg in pkgutil.walk_packages(package_files):
-        if name == "__main__":
-            continue
-        try:
-            full_name = package.__name__ + "." + name
-            results[full_name] = importlib.import_module(full_name)
+    excluded = frozenset(exclude) | {"__main__"}
+    # `walk_packages` would import excluded subpackages to list their content
+    to_scan = [(package_files, package.__name__ + ".")]
+    while to_scan:
+        path, prefix = to_scan.pop()
+        for _, full_name, is_pkg in pkgutil.iter_modules(path, prefix):
+            if full_name.rpartition(".")[2] in excluded:
+                continue
+            try:
+                module = sys.modules.get(full_name)
+                if module is None:
+                    module = importlib.import_module(full_name)
+            except (ModuleNotFoundError, ValueError):
+                if not ignore_errors:
+                    raise
+                continue
+            results[full_name] = module
             if recursive and is_pkg:
-                results.update(import_submodules(full_name))
-        except ModuleNotFoundError:
-            if not ignore_errors:
-                raise
-        except ValueError:
-            if not ignore_errors:
-                raise
+                to_scan.append((module.__path__, full_name + "."))
     return results
 
 
@@ -81,21 +179,44 @@ def get_module_and_class(obj: Any) -> tuple[str, str]:
     return type(obj).__module__, type(obj).__qualname__
 
 
+# the last formatted second, as [posix seconds, isoformat]
+_isoformat_now_cache: list[Any] = [None, ""]
+
+
 def isoformat_now(clear_microseconds: bool = True) -> str:
-    date = datetime.utcnow()
-    if clear_microseconds:
-        date = date.replace(microsecond=0)
-    return date.isoformat()
+    if not clear_microseconds:
+        return datetime.utcnow().isoformat()
+    seconds = int(time.time())
+    if _isoformat_now_cache[0] != seconds:
+        date = datetime.utcfromtimestamp(seconds)
+        _isoformat_now_cache[:] = [seconds, date.isoformat()]
+    return _isoformat_now_cache[1]
 
 
+# the time format of run keys, e.g. `2022-01-31T12-30-00`
+_RUN_KEY_TIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2})-(\d{2})-(\d{2})(?:Z|\+\d{2}:\d{2})?"
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_time(date_str: str) -> datetime:
+    # run keys are not ISO formatted. Parse them without the failing
+    # `fromisoformat` call.
+    match = _RUN_KEY_TIME.fullmatch(date_str)
+    if match is not None:
+        year, month, day, hour, minute, second = map(int, match.groups())
+        return datetime(
+            year, month, day, hour, minute, second, tzinfo=timezone.utc
+        )
+
     if date_str.endswith("Z"):
         date_str = date_str[:-1]
-
-    if "T" not in date_str:
-        date_str += "T00:00:00"
-    if "+" not in date_str:
-        date_str += "+00:00"
+        tz = "+00:00"
+    else:
+        tz = "" if "+" in date_str else "+00:00"
+    time_of_day = "" if "T" in date_str else "T00:00:00"
+    date_str = f"{date_str}{time_of_day}{tz}"
 
     try:
         return datetime.fromisoformat(date_str)
@@ -1,4 +1,4 @@
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 import pytest
 
@@ -10,7 +10,7 @@ def storage(tmp_path: Path) -> io.B2Storage:
     fake_b2 = io.SimulatedB2API()
     return io.B2Storage(
         local_path=tmp_path,
-        remote_path=Path("test"),
+        remote_path=PurePosixPath("test"),
         b2_bucket=fake_b2.bucket_name,
         b2_key_id=fake_b2.application_key_id,
         b2_key=fake_b2.master_key,
@@ -1,4 +1,7 @@
 import dataclasses
+import gc
+import weakref
+from typing import ClassVar
 
 import pytest
 
@@ -25,3 +28,47 @@ class NoDataclassArgs(savethat.Args):
 def test_no_dataclass_raises():
     with pytest.raises(TypeError):
         NoDataclassArgs.parse_args(["--name", "Bodo", "--n_times", "10"])
+
+
+def test_args_dict_roundtrip():
+    args = MyArgs(name="Bodo", n_times=10)
+    state = args.as_dict(with_class_info=True)
+    assert state["__qualname__"] == "MyArgs"
+    assert MyArgs.from_dict(state) == args
+    # the parser class is cached, so a second round-trip must work as well
+    assert MyArgs.from_dict(args.as_dict()) == args
+
+
+@dataclasses.dataclass(frozen=True)
+class ClassVarArgs(savethat.Args):
+    name: str
+    registry: ClassVar[dict[str, int]] = {}
+
+
+def test_class_vars_are_not_arguments():
+    args = ClassVarArgs.parse_args(["--name", "Bodo"])
+    assert args.name == "Bodo"
+    assert ClassVarArgs._get_keys() == ["name"]
+
+
+def test_from_dict_skips_unknown_keys() -> None:
+    state = {"name": "Bodo", "n_times": 10, "not_an_arg": 2}
+    assert MyArgs.from_dict(state) == MyArgs(name="Bodo", n_times=10)
+    args = MyArgs.from_dict(state, skip_unsettable=True)
+    assert args == MyArgs(name="Bodo", n_times=10)
+    with pytest.raises(TypeError):
+        MyArgs.from_dict({"name": "Bodo"})
+
+
+def test_cached_args_classes_can_be_collected() -> None:
+    @dataclasses.dataclass(frozen=True)
+    class TemporaryArgs(savethat.Args):
+        value: int
+
+    args = TemporaryArgs.parse_args(["--value", "3"])
+    assert TemporaryArgs.from_dict(args.as_dict()) == args
+
+    ref = weakref.ref(TemporaryArgs)
+    del TemporaryArgs, args
+    gc.collect()
+    assert ref() is None
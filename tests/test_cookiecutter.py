@@ -1,6 +1,7 @@
 import getpass
 import os
 import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -67,10 +68,8 @@ def test_cookie_template(tmp_path: Path, template_dir: Path) -> None:
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
     )
-    assert proc.stdout is not None
-
-    while proc.poll() is None:
-        print(proc.stdout.readline().decode("utf-8"), end="")
+    stdout, _ = proc.communicate()
+    sys.stdout.write(stdout.decode("utf-8", errors="replace"))
 
     print(f"Template was renderd to {template_dir}")
     assert proc.returncode == 0
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from savethat import env
+
+
+def test_load_credentials_sees_updates(tmp_path: Path) -> None:
+    credential_file = tmp_path / "credentials.toml"
+    env.store_credentials(
+        "first",
+        env.B2Credentials.no_syncing(tmp_path / "first"),
+        credential_file,
+    )
+    assert env.load_credentials("first", credential_file).local_path == str(
+        tmp_path / "first"
+    )
+
+    env.store_credentials(
+        "second",
+        env.B2Credentials.no_syncing(tmp_path / "second"),
+        credential_file,
+    )
+    cred = env.load_credentials("second", credential_file)
+    assert cred.local_path == str(tmp_path / "second")
+    assert cred.skip_syncing
+
+
+def test_store_credentials_without_toml_suffix(tmp_path: Path) -> None:
+    credential_file = tmp_path / "credentials"
+    for package in ["first", "second"]:
+        env.store_credentials(
+            package,
+            env.B2Credentials.no_syncing(tmp_path / package),
+            credential_file,
+        )
+    config = env.read_config_file(credential_file, ".toml")
+    assert set(config) == {"first", "second"}
+
+
+def test_read_config_file_json(tmp_path: Path) -> None:
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"config": "from_json", "number": 1}')
+    assert env.read_config_file(config_file) == {
+        "config": "from_json",
+        "number": 1,
+    }
+
+
+def test_read_config_file_yaml(tmp_path: Path) -> None:
+    pytest.importorskip("yaml")
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("config: from_yaml\nnumber: 1\n")
+    assert env.read_config_file(config_file) == {
+        "config": "from_yaml",
+        "number": 1,
+    }
+
+
+def test_load_host_settings(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        env.load_host_settings(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        env.load_host_settings(tmp_path / "missing")
+
+    (tmp_path / "default.toml").write_text('value = "default"\n')
+    assert env.load_host_settings(tmp_path) == {"value": "default"}
+
+    user, host = env._user_and_host()
+    (tmp_path / f"{user}@{host}.toml").write_text('value = "host"\n')
+    assert env.load_host_settings(tmp_path) == {"value": "host"}
@@ -1,7 +1,13 @@
+import dataclasses
+import os
 import shutil
+from pathlib import Path, PureWindowsPath
+
+import pytest
+from b2sdk.v2.exception import DestFileNewer
 
 import savethat
-from savethat import io
+from savethat import env, io
 
 
 def test_b2_find_remote(storage: io.B2Storage) -> None:
@@ -18,14 +24,14 @@ def test_b2_upload(storage: io.B2Storage) -> None:
     storage.remove("test_config_dir")
     path = storage / key
     path.mkdir(exist_ok=True)
-    (path / "test_file").write_text("hello world!")
+    (path / "test_file").write_bytes(b"hello world!")
     assert storage / key == path
     storage.upload(key)
     shutil.rmtree(path)
     assert not path.exists()
     download_path = storage.download(key)
     assert download_path == path
-    assert (path / "test_file").read_text() == "hello world!"
+    assert (path / "test_file").read_bytes() == b"hello world!"
     shutil.rmtree(path)
 
 
@@ -44,3 +50,242 @@ def test_find_runs(storage: io.B2Storage) -> None:
 
     runs = list(storage.find_runs(only_completed=True))
     assert len(runs) == 0
+
+
+def test_runs_from_windows_paths() -> None:
+    paths = [
+        PureWindowsPath("run_a\\args.json"),
+        PureWindowsPath("run_a\\sub\\file.txt"),
+        PureWindowsPath("run_b\\args.json"),
+    ]
+    runs = io.Storage._runs_from_paths(paths)  # type: ignore[arg-type]
+    assert runs == {
+        "run_a": ["run_a/args.json", "run_a/sub/file.txt"],
+        "run_b": ["run_b/args.json"],
+    }
+
+
+def test_remote_ls_prefix(storage: io.B2Storage) -> None:
+    for key in ["run_a/sub", "run_b", "other"]:
+        path = storage / key
+        path.mkdir(parents=True)
+        (path / "file.txt").write_text("content")
+        storage.upload(key)
+
+    files = set(map(str, storage.remote_ls("run_", recursive=True)))
+    assert files == {"run_a/sub/file.txt", "run_b/file.txt"}
+
+    files = set(map(str, storage.remote_ls("run_a/su", recursive=True)))
+    assert files == {"run_a/sub/file.txt"}
+
+    files = set(map(str, storage.remote_ls(recursive=True)))
+    assert "other/file.txt" in files
+
+    storage.remote_path = storage.remote_path / "run_a"
+    files = set(map(str, storage.remote_ls(recursive=True)))
+    assert files == {"sub/file.txt"}
+
+
+def test_remove_remote(storage: io.B2Storage) -> None:
+    key = "run_to_remove"
+    path = storage / key
+    path.mkdir()
+    for i in range(5):
+        (path / f"file_{i}.txt").write_text(str(i))
+    storage.upload(key)
+    assert len(list(storage.remote_ls(key, recursive=True))) == 5
+
+    storage.remove(key, local=True, remote=True)
+    assert not path.exists()
+    assert list(storage.remote_ls(key, recursive=True)) == []
+
+
+def test_remove_many(storage: io.B2Storage) -> None:
+    keys = [f"run_to_remove_{i}" for i in range(3)]
+    for key in keys:
+        (storage / key).mkdir()
+        (storage / key / "file.txt").write_text(key)
+        storage.upload(key)
+
+    with pytest.raises(ValueError):
+        storage.remove_many(keys, local=False, remote=True)
+
+    storage.remove_many(keys, local=True, remote=True)
+    for key in keys:
+        assert not (storage / key).exists()
+        assert list(storage.remote_ls(key, recursive=True)) == []
+
+
+def test_upload_many_files(storage: io.B2Storage) -> None:
+    key = "many_files"
+    path = storage / key
+    (path / "sub").mkdir(parents=True)
+    n_files = io.PARALLEL_UPLOAD_MIN_FILES + 8
+    for i in range(n_files):
+        (path / "sub" / f"file_{i}.txt").write_text(str(i))
+    storage.upload(key)
+    # nothing changed, so the second upload should skip all files
+    storage.upload(key)
+
+    remote_files = list(storage.remote_ls(key, recursive=True))
+    assert len(remote_files) == n_files
+
+    shutil.rmtree(path)
+    storage.download(key)
+    assert (path / "sub" / "file_3.txt").read_text() == "3"
+
+
+@pytest.mark.parametrize("n_files", [1, io.PARALLEL_UPLOAD_MIN_FILES + 1])
+def test_upload_raises_on_newer_remote_file(
+    storage: io.B2Storage, n_files: int
+) -> None:
+    key = f"newer_remote_{n_files}"
+    path = storage / key
+    path.mkdir()
+    for i in range(n_files):
+        (path / f"file_{i}.txt").write_text(str(i))
+    storage.upload(key)
+
+    newer = int((path / "file_0.txt").stat().st_mtime * 1000) + 60_000
+    storage.bucket.upload_bytes(
+        b"newer",
+        f"{storage.remote_path / key}/file_0.txt",
+        file_info={"src_last_modified_millis": str(newer)},
+    )
+    (path / "file_0.txt").write_text("changed")
+    older = (newer - 30_000) / 1000
+    os.utime(path / "file_0.txt", (older, older))
+    with pytest.raises(DestFileNewer):
+        storage.upload(key)
+
+
+def test_download_parallel(storage: io.B2Storage) -> None:
+    key = "download_many"
+    path = storage / key
+    path.mkdir()
+    n_files = 40
+    for i in range(n_files):
+        (path / f"file_{i}.txt").write_text(str(i))
+    storage.upload(key)
+
+    shutil.rmtree(path)
+    (path).mkdir()
+    # an older local file is replaced
+    (path / "file_0.txt").write_text("old")
+    os.utime(path / "file_0.txt", (0, 0))
+    assert storage.download_parallel(key) == path
+    assert len(list(path.iterdir())) == n_files
+    assert (path / "file_0.txt").read_text() == "0"
+    assert (path / "file_7.txt").read_text() == "7"
+
+
+@pytest.mark.parametrize("n_files", [1, 40])
+def test_download_raises_on_newer_local_file(
+    storage: io.B2Storage, n_files: int
+) -> None:
+    key = f"newer_local_{n_files}"
+    path = storage / key
+    path.mkdir()
+    for i in range(n_files):
+        (path / f"file_{i}.txt").write_text(str(i))
+    storage.upload(key)
+
+    newer = (path / "file_0.txt").stat().st_mtime + 60
+    os.utime(path / "file_0.txt", (newer, newer))
+    with pytest.raises(DestFileNewer):
+        storage.download(key)
+
+
+def test_open_downloads_remote_file(storage: io.B2Storage) -> None:
+    key = "open_test"
+    with storage.open(f"{key}/file.txt", "w") as f:
+        f.write("remote content")
+    storage.upload(key)
+    shutil.rmtree(storage / key)
+
+    with storage.open(f"{key}/file.txt") as f:
+        assert f.read() == "remote content"
+
+    with storage.open(f"{key}/new_file.txt", "a") as f:
+        f.write("appended")
+    assert (storage / key / "new_file.txt").read_text() == "appended"
+
+
+def test_open_finds_files_uploaded_by_others(
+    storage: io.B2Storage, tmp_path: Path
+) -> None:
+    writer = dataclasses.replace(storage, local_path=tmp_path / "writer")
+    (writer / "run").mkdir(parents=True)
+    (writer / "run" / "args.json").write_text("{}")
+    writer.upload("run")
+
+    with storage.open("run/args.json") as f:
+        assert f.read() == "{}"
+
+    (writer / "run" / "results.txt").write_text("done")
+    writer.upload("run")
+    with storage.open("run/results.txt") as f:
+        assert f.read() == "done"
+
+
+def test_simulated_b2_api_is_shared(tmp_path: Path) -> None:
+    io._reset_simulated_b2_api()
+    credentials = env.B2Credentials.no_syncing(tmp_path)
+    first = io.B2Storage.from_credentials(credentials)
+    second = io.B2Storage.from_credentials(credentials)
+    assert first.bucket is second.bucket
+
+    io._reset_simulated_b2_api()
+    third = io.B2Storage.from_credentials(credentials)
+    assert third.bucket is not first.bucket
+
+
+def test_simulated_b2_api_is_not_shared_between_local_paths(
+    tmp_path: Path,
+) -> None:
+    first = io.B2Storage.from_credentials(
+        env.B2Credentials.no_syncing(tmp_path / "first")
+    )
+    second = io.B2Storage.from_credentials(
+        env.B2Credentials.no_syncing(tmp_path / "second")
+    )
+    assert first.bucket is not second.bucket
+
+    (first / "run").mkdir(parents=True)
+    (first / "run" / "file.txt").write_text("first")
+    first.upload("run")
+    with pytest.raises(FileNotFoundError):
+        with second.open("run/file.txt") as f:
+            f.read()
+
+
+def test_open_closes_file_on_error(storage: io.B2Storage) -> None:
+    with pytest.raises(RuntimeError):
+        with storage.open("open_error/file.txt", "w") as f:
+            raise RuntimeError()
+    assert f.closed
+
+
+def test_open_missing_file_creates_no_dirs(storage: io.B2Storage) -> None:
+    with pytest.raises(FileNotFoundError):
+        with storage.open("missing_dir/file.txt") as f:
+            f.read()
+    assert not (storage / "missing_dir").exists()
+
+
+def test_open_append_keeps_local_file(storage: io.B2Storage) -> None:
+    key = "append_test/file.txt"
+    with storage.open(key, "w") as f:
+        f.write("remote")
+    storage.upload("append_test")
+
+    with storage.open(key, "w") as f:
+        f.write("local")
+    with storage.open(key, "a") as f:
+        f.write(" appended")
+    assert (storage / key).read_text() == "local appended"
+
+    (storage / key).unlink()
+    with storage.open(key, "a") as f:
+        f.write(" appended")
+    assert (storage / key).read_text() == "remote appended"
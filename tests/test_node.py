@@ -1,4 +1,6 @@
 import dataclasses
+import json
+import math
 import random
 from pathlib import Path
 from typing import Any
@@ -70,3 +72,82 @@ def test_run_pipeline(storage: io.Storage) -> None:
     args = SampleIntArgs(max=20)
 
     pipeline("test_pipeline", args, storage).run()
+
+
+class RemoteArgsCheck(node_mod.Node[SampleIntArgs, bool]):
+    def _run(self) -> bool:
+        assert isinstance(self.storage, io.B2Storage)
+        remote_files = self.storage.remote_ls(self.key, recursive=True)
+        return Path(self.key) / "args.json" in set(remote_files)
+
+
+def test_args_are_uploaded_before_run(storage: io.Storage) -> None:
+    savethat.set_project_dir(Path(__file__).parent.absolute())
+    node = RemoteArgsCheck("test_eager_upload", SampleIntArgs(max=1), storage)
+    assert node.run()
+
+
+def test_reproducible_copies_do_not_share_data() -> None:
+    test_dir = Path(__file__).parent.absolute()
+    first = node_mod.get_reproducible(test_dir)
+    second = node_mod.get_reproducible(test_dir)
+    first.add_data("node", "first")
+    second.add_data("node", "second")
+    assert first.data["data"]["node"] == "first"
+    assert second.data["data"]["node"] == "second"
+    assert "node" not in node_mod.get_reproducible(test_dir).data.get(
+        "data", {}
+    )
+
+
+def test_reproducible_copies_do_not_share_repositories() -> None:
+    test_dir = Path(__file__).parent.absolute()
+    first = node_mod.get_reproducible(test_dir)
+    first.add_repo(str(test_dir.parent), allow_dirty=True, diff=False)
+    first.data["repositories"][str(test_dir)]["dirty"] = "modified"
+
+    second = node_mod.get_reproducible(test_dir)
+    assert str(test_dir.parent) not in second.data["repositories"]
+    assert second.data["repositories"][str(test_dir)]["dirty"] != "modified"
+
+
+def test_reproducible_json_keeps_values(storage: io.Storage) -> None:
+    savethat.set_project_dir(Path(__file__).parent.absolute())
+    node = SampleInt("test_reproducible_json", SampleIntArgs(max=1), storage)
+    node.reproducible.add_data("nan_metric", float("nan"))
+    node.reproducible.add_data("big_number", 2**70)
+    node.run()
+
+    path = node.storage / node.output_dir / "reproducible.json"
+    data = json.loads(path.read_text())["data"]
+    assert math.isnan(data["nan_metric"])
+    assert data["big_number"] == 2**70
+
+
+@pytest.mark.parametrize("pass_reproducible", [False, True])
+def test_reproducible_has_node_data(
+    storage: io.Storage, pass_reproducible: bool
+) -> None:
+    test_dir = Path(__file__).parent.absolute()
+    savethat.set_project_dir(test_dir)
+    reproducible = (
+        node_mod.get_reproducible(test_dir) if pass_reproducible else None
+    )
+    node = SampleInt(
+        "test_reproducible_node_data",
+        SampleIntArgs(max=1),
+        storage,
+        reproducible=reproducible,
+    )
+    data = node.reproducible.data["data"]
+    assert data["node.__module__"] == SampleInt.__module__
+    assert data["node.__qualname__"] == SampleInt.__qualname__
+
+
+def test_reproducible_can_be_assigned(storage: io.Storage) -> None:
+    test_dir = Path(__file__).parent.absolute()
+    savethat.set_project_dir(test_dir)
+    node = SampleInt("test_reproducible_assign", SampleIntArgs(max=1), storage)
+    reproducible = node_mod.get_reproducible(test_dir)
+    node.reproducible = reproducible
+    assert node.reproducible is reproducible
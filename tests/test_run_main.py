@@ -1,5 +1,6 @@
 import contextlib
 import dataclasses
+import gc
 import io
 import sys
 from contextlib import redirect_stderr, redirect_stdout
@@ -13,6 +14,7 @@ import savethat
 from savethat import env
 from savethat import node as node_mod
 from savethat.io import PATH_LIKE
+from savethat.run_main import MainRunner
 
 
 @dataclasses.dataclass(frozen=True)
@@ -31,9 +33,10 @@ def run_main(
     credential_file: PATH_LIKE,
     argv: list[str] = [],
 ) -> Optional[tuple[savethat.Node[savethat.ARGS, Any], Any]]:
-    test_dir = Path(__file__).parent.absolute()
+    test_dir = str(Path(__file__).parent.absolute())
     # Appending path to make file a package
-    sys.path.append(str(test_dir))
+    if test_dir not in sys.path:
+        sys.path.append(test_dir)
     print("-" * 80)
 
     print(f"Running {package} with args: {' '.join(argv)}")
@@ -93,6 +96,13 @@ def test_main_help(credential_file: Path) -> None:
     assert "Here is a list with all available actions:" in f.getvalue()
 
 
+def test_main_run_help(credential_file: Path) -> None:
+    f = io.StringIO()
+    with redirect_stdout(f):
+        run_main("test_run_main", credential_file, argv=["run", "--help"])
+    assert "node_name" in f.getvalue()
+
+
 def test_main_node_help(credential_file: Path) -> None:
     f = io.StringIO()
     with redirect_stdout(f), redirect_stderr(f), pytest.raises(SystemExit):
@@ -152,6 +162,13 @@ def test_main_ls_last(credential_file: Path) -> None:
     assert "ConfigTest" in out
     print(out)
 
+    with pytest.raises(ValueError, match="--last"):
+        run_main(
+            "test_run_main",
+            credential_file,
+            argv=["ls", "--local", "--last", "3w"],
+        )
+
 
 @contextlib.contextmanager
 def replace_stdin(target: io.StringIO) -> Iterator[None]:
@@ -230,6 +247,31 @@ def test_setup_credentials_with_syncing(tmp_path: Path) -> None:
     assert not cred.skip_syncing
 
 
+def test_find_all_subclasses_sees_new_nodes() -> None:
+    assert ConfigTest in MainRunner.find_all_subclasses()
+
+    class NewNode(node_mod.Node[ConfigTestArgs, str]):
+        def _run(self) -> str:
+            return self.args.config
+
+    try:
+        assert NewNode in MainRunner.find_all_subclasses()
+    finally:
+        # do not return the node in later tests
+        del NewNode
+        MainRunner.clear_cache()
+        gc.collect()
+
+
+def test_parsers_are_shared(credential_file: Path) -> None:
+    runners = [
+        MainRunner("test_run_main", credential_file, argv=["ls"])
+        for _ in range(2)
+    ]
+    assert runners[0].parser is runners[1].parser
+    assert runners[0].ls_parser is not None
+
+
 if __name__ == "__main__":
     test_dir = Path(__file__).parent.absolute()
     sys.path.append(str(test_dir))
@@ -0,0 +1,88 @@
+import importlib
+import math
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from savethat import utils
+
+
+def test_import_submodules_of_subpackages() -> None:
+    modules = utils.import_submodules("xml")
+    assert "xml.dom" in modules
+    assert "xml.dom.minidom" in modules
+
+    modules = utils.import_submodules("xml", recursive=False)
+    assert "xml.dom" in modules
+    assert "xml.dom.minidom" not in modules
+
+
+def test_isoformat_now() -> None:
+    now = utils.isoformat_now()
+    assert "." not in now
+    assert utils.parse_time(now).microsecond == 0
+    assert utils.isoformat_now() >= now
+
+
+def test_parse_time_of_run_key() -> None:
+    expected = datetime(2022, 1, 31, 12, 30, tzinfo=timezone.utc)
+    assert utils.parse_time("2022-01-31T12-30-00") == expected
+    assert utils.parse_time("2022-01-31T12-30-00Z") == expected
+    assert utils.parse_time("2022-01-31T12:30:00") == expected
+
+
+def test_import_submodules_exclude() -> None:
+    modules = utils.import_submodules("xml", exclude=("dom",))
+    assert "xml.etree" in modules
+    assert not any(name.startswith("xml.dom") for name in modules)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_round_trip(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(utils, "orjson", None)
+    obj = {
+        "nan": float("nan"),
+        "inf": float("inf"),
+        "big": 2**70,
+        "int_keys": {1: "one"},
+    }
+    path = tmp_path / "obj.json"
+    utils.dump_json(obj, path)
+    loaded = utils.load_json(path)
+    assert math.isnan(loaded["nan"])
+    assert loaded["inf"] == float("inf")
+    assert loaded["big"] == 2**70
+    assert loaded["int_keys"] == {"1": "one"}
+
+    utils.dump_json({"b": 1, "a": [1.5]}, path, sort_keys=True)
+    assert path.read_text() == '{\n  "a": [\n    1.5\n  ],\n  "b": 1\n}'
+
+    with pytest.raises(TypeError):
+        utils.dump_json({"b": 1, 2: [1.5]}, path, sort_keys=True)
+    with pytest.raises(TypeError):
+        utils.dump_json({"id": uuid.uuid4()}, path)
+
+
+def test_load_class_after_reload(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    module_file = tmp_path / "reloaded_module.py"
+    module_file.write_text("class A:\n    version = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # the rewritten file could otherwise match a stale bytecode cache
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.delitem(sys.modules, "reloaded_module", raising=False)
+
+    assert utils.load_class("reloaded_module.A").version == 1
+
+    module_file.write_text("class A:\n    version = 2\n")
+    importlib.reload(sys.modules["reloaded_module"])
+    assert utils.load_class("reloaded_module", "A").version == 2